@@ -1,19 +1,35 @@
-from functools import total_ordering
 from itertools import product
 from random import shuffle
 
 
-@total_ordering
 class Suit:
     """
     Represents the four suits: clubs, diamonds, hearts, and spades.
     Their cardinality from lowest to highest is in that order.
     """
 
+    __slots__ = ("suit", "name", "symbol", "order", "bit")
+
     NAMES = ["clubs", "diamonds", "hearts", "spades"]
     SYMBOLS = ["♣", "♦", "♥", "♠"]
 
-    def __init__(self, suit: str):
+    # Shared instances, keyed by every spelling they have been requested with
+    _instances = {}
+
+    def __new__(cls, suit: str):
+        """
+        There are only four suits, so each is validated once and then shared by every
+        card of that suit
+        """
+        if isinstance(suit, str) and suit in cls._instances:
+            return cls._instances[suit]
+
+        self = super().__new__(cls)
+        self._validate(suit)
+        cls._instances[suit] = cls._instances.setdefault(self.name, self)
+        return cls._instances[suit]
+
+    def _validate(self, suit: str):
         if not isinstance(suit, str):
             raise TypeError("Suit must be identified by a string")
 
@@ -30,38 +46,50 @@ class Suit:
             self.name = self.NAMES[self.SYMBOLS.index(self.suit)]
             self.symbol = self.suit
 
-    def __key(self):
-        """Hash key"""
-        return self.name
-
-    def _block_cross_type_comaprisons(self, other):
-        if not isinstance(other, Suit):
-            return NotImplemented
+        self.order = self.NAMES.index(self.name)
+        # One bit per suit in the 0xF000 nibble of a card's integer code
+        self.bit = 0x1000 << self.order
 
     def __repr__(self):
         return self.name.title()
 
+    def __reduce__(self):
+        # Copies and unpickled suits resolve back to the shared instance
+        return (Suit, (self.name,))
+
+    # Suits are shared instances, so equal suits are the same object
     def __eq__(self, other):
-        self._block_cross_type_comaprisons(other)
-        return self.symbol == other.symbol
+        return self is other
 
+    def __ne__(self, other):
+        return self is not other
+
+    # We compare by alphabetical order (English ranking)
     def __lt__(self, other):
-        # We compare by alphabetical order (English ranking)
-        self._block_cross_type_comaprisons(other)
-        return self.NAMES.index(self.name) < self.NAMES.index(other.name)
+        return self.order < other.order
+
+    def __le__(self, other):
+        return self.order <= other.order
+
+    def __gt__(self, other):
+        return self.order > other.order
+
+    def __ge__(self, other):
+        return self.order >= other.order
 
     def __hash__(self):
-        return hash(self.__key())
+        return id(self)
 
 
-@total_ordering
 class Rank:
     """
     Represents the rank of a playing card from A to K.
-    Comparison operations based on order rather than value; to compare value,
-        access that attribute directly.
+    Comparison operations based on value, with ties (e.g., 10, J, Q, K) broken by
+        order; to compare value alone, access that attribute directly.
     """
 
+    __slots__ = ("rank", "value", "order", "name", "index", "prime", "sort_key")
+
     # Value tuples are (value, order, proper name)
     RANKS = {
         "A": (11, 1, "ace"),  # Ace-high in straights handled by hand logic
@@ -79,10 +107,29 @@ class Rank:
         "K": (10, 13, "king"),
     }
 
+    # One prime per rank, deuce to ace, used to build each card's integer code
+    PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
     # "Broadway" usually includes 10, but whatever
     BROADWAY_RANKS = {"ACE": "A", "JACK": "J", "QUEEN": "Q", "KING": "K"}
 
-    def __init__(self, rank: str):
+    # Shared instances, keyed by every spelling they have been requested with
+    _instances = {}
+
+    def __new__(cls, rank: str):
+        """
+        There are only thirteen ranks, so each is validated once and then shared by
+        every card of that rank
+        """
+        if isinstance(rank, str) and rank in cls._instances:
+            return cls._instances[rank]
+
+        self = super().__new__(cls)
+        self._validate(rank)
+        cls._instances[rank] = cls._instances.setdefault(self.rank, self)
+        return cls._instances[rank]
+
+    def _validate(self, rank: str):
         """Validates rank and sets the order value for easier comparison"""
         if not isinstance(rank, str):
             raise TypeError("Rank must be provided as a string")
@@ -100,70 +147,103 @@ class Rank:
         self.value = self.RANKS[self.rank][0]
         self.order = self.RANKS[self.rank][1]
         self.name = self.RANKS[self.rank][2]
-
-    def __key(self):
-        """Hash key"""
-        return self.value
-
-    def _block_cross_type_comaprisons(self, other):
-        if not isinstance(other, Rank):
-            return NotImplemented
+        # Poker strength from deuce (0) to ace (12)
+        self.index = (self.order - 2) % 13
+        self.prime = self.PRIMES[self.index]
+        # Orders ranks by value, then order, so that e.g. K is above Q
+        self.sort_key = (self.value << 4) | self.order
 
     def __repr__(self):
         return self.name.title()
 
+    def __reduce__(self):
+        # Copies and unpickled ranks resolve back to the shared instance
+        return (Rank, (self.rank,))
+
+    # Ranks are shared instances, so equal ranks are the same object
     def __eq__(self, other):
-        self._block_cross_type_comaprisons(other)
-        return self.name == other.name
+        return self is other
+
+    def __ne__(self, other):
+        return self is not other
 
     def __lt__(self, other):
-        self._block_cross_type_comaprisons(other)
-        return self.value < other.value
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other):
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other):
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other):
+        return self.sort_key >= other.sort_key
 
     def __hash__(self):
-        return hash(self.__key())
+        return id(self)
 
 
-@total_ordering
 class Card:
     """
     Represents a playing card, with a Rank and Suit
     Crucially: equality of two cards is based on both their rank and suit.
     This deviates from Poker and many other games; this is crucial for the
     hashability of Cards.
+
+    Each card is also encoded as a single integer, following Cactus Kev:
+        xxxAKQJT 98765432 SHDCrrrr xxpppppp
+    i.e., one bit per rank, one bit per suit, the rank index, and the rank's prime.
     """
 
+    __slots__ = ("rank", "suit", "code", "sort_key")
+
     def __init__(self, rank: int | str, suit: str):
         self.rank = Rank(str(rank))
         self.suit = Suit(suit)
-
-    def __key(self):
-        """Hash key"""
-        return (self.rank, self.suit)
-
-    def _block_cross_type_comaprisons(self, other):
-        if not isinstance(other, Card):
-            return NotImplemented
+        self.code = (
+            (1 << (16 + self.rank.index))
+            | self.suit.bit
+            | (self.rank.index << 8)
+            | self.rank.prime
+        )
+        # Orders cards by rank value, then rank order (e.g., K above Q), then suit;
+        #   also used as the key when sorting hands
+        self.sort_key = (self.rank.sort_key << 4) | self.suit.order
 
     def __repr__(self):
         return f"{self.rank} of {self.suit}"
 
+    def __int__(self):
+        return self.code
+
     def __eq__(self, other):
-        self._block_cross_type_comaprisons(other)
-        return self.rank == other.rank and self.suit == other.suit
+        return self.sort_key == other.sort_key
+
+    def __ne__(self, other):
+        return self.sort_key != other.sort_key
 
     def __lt__(self, other):
-        self._block_cross_type_comaprisons(other)
-        if self.rank < other.rank:
-            return True
-        elif self.rank == other.rank:
-            # Use suits to break ties
-            return self.suit < other.suit
-        else:
-            return False
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other):
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other):
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other):
+        return self.sort_key >= other.sort_key
 
     def __hash__(self):
-        return hash(self.__key())
+        # Codes are unique per rank/suit pair, and already ints
+        return self.code
+
+
+# Cards are never mutated, so every Deck can share the same 52 of them
+STANDARD_CARDS = tuple(
+    Card(rank=rank, suit=suit) for rank, suit in product(Rank.RANKS, Suit.NAMES)
+)
+STANDARD_CODES = tuple(c.code for c in STANDARD_CARDS)
 
 
 class Deck:
@@ -172,27 +252,37 @@ class Deck:
     """
 
     def __init__(self, shuffled: bool = False):
-        self.cards = [
-            Card(rank=rank, suit=suit) for rank, suit in product(Rank.RANKS, Suit.NAMES)
-        ]
+        # Drawn cards stay in self.cards; _pos marks the top of what is left
+        self.cards = list(STANDARD_CARDS)
+        self._pos = 0
 
         if shuffled:
             self.shuffle()
 
+    @property
+    def remaining(self) -> int:
+        """Number of cards not yet drawn"""
+        return len(self.cards) - self._pos
+
     def shuffle(self):
-        shuffle(self.cards)
+        """Shuffles the cards not yet drawn"""
+        undrawn = self.cards[self._pos :]
+        shuffle(undrawn)
+        self.cards[self._pos :] = undrawn
 
     def draw(self, n: int = 0):
         """
-        Returns n cards from the deck. If less than n cards are available,
-            raise an error
+        Returns n cards from the deck. If less than n cards are available, or n is
+            negative, raise an error
         """
-        if n > len(self.cards):
+        if n < 0:
+            raise ValueError(f"Cannot draw a negative number of cards ({n})")
+        if n > self.remaining:
             raise ValueError(
-                f"Not enough cards left in deck to draw ({len(self.cards)} remaining)"
+                f"Not enough cards left in deck to draw ({self.remaining} remaining)"
             )
-        drawn_cards = self.cards[:n]
-        del self.cards[:n]
+        drawn_cards = self.cards[self._pos : self._pos + n]
+        self._pos += n
         return drawn_cards
 
     def draw_hand(self):
@@ -1,21 +1,126 @@
+from bisect import bisect_left
 from collections import Counter
-from itertools import combinations
+from functools import reduce
+from itertools import combinations, product
+from operator import and_, attrgetter, or_
+from random import sample
 
 
 from classes import Card
+from classes.cards import STANDARD_CODES
+from engine_core import eval5_unrolled, eval_batch
+from engine_tables import (
+    HAND_CATEGORY_BOUNDS,
+    RANK_BITS_SHIFT,
+    RANK_INDEX_MASK,
+    RANK_INDEX_SHIFT,
+    SUIT_MASK,
+)
 
 
 """
 Logic to discover Poker Hands in a set of five cards
 """
 
+# All ten five-high through ace-high straights, as rank bitmasks
+WHEEL_MASK = 0b1_0000_0000_1111
+HIGH_STRAIGHT_MASK = 0b1_1111_0000_0000
+STRAIGHT_BITMASKS = frozenset({0b11111 << i for i in range(9)} | {WHEEL_MASK})
+
+# Sort keys: by_sort_key puts aces high, by_rank_order puts them low
+by_sort_key = attrgetter("sort_key")
+by_rank_order = attrgetter("rank.order")
+
+CATEGORY_WORST_RANKS = [worst for worst, _ in HAND_CATEGORY_BOUNDS]
+CATEGORY_NAMES = [name for _, name in HAND_CATEGORY_BOUNDS]
+
+# One bit per find_hands key, from weakest to strongest hand, so that the highest bit
+# set in a hand's types is always its best hand
+HAND_TYPE_NAMES = CATEGORY_NAMES[::-1]
+HAND_TYPE_BITS = {name: 1 << i for i, name in enumerate(HAND_TYPE_NAMES)}
+HIGH_CARD = HAND_TYPE_BITS["high card"]
+PAIRS = HAND_TYPE_BITS["pairs"]
+TWO_PAIRS = HAND_TYPE_BITS["two pairs"]
+THREE_OF_A_KINDS = HAND_TYPE_BITS["three of a kinds"]
+STRAIGHT = HAND_TYPE_BITS["straight"]
+FLUSH = HAND_TYPE_BITS["flush"]
+FULL_HOUSE = HAND_TYPE_BITS["full house"]
+FOUR_OF_A_KINDS = HAND_TYPE_BITS["four of a kinds"]
+STRAIGHT_FLUSH = HAND_TYPE_BITS["straight flush"]
+ROYAL_FLUSH = HAND_TYPE_BITS["royal flush"]
+
+# Every hand type contained in each best hand
+STRAIGHT_FLUSH_TYPES = HIGH_CARD | STRAIGHT | FLUSH | STRAIGHT_FLUSH
+CATEGORY_TYPES = {
+    "royal flush": STRAIGHT_FLUSH_TYPES | ROYAL_FLUSH,
+    "straight flush": STRAIGHT_FLUSH_TYPES,
+    "four of a kinds": HIGH_CARD | PAIRS | THREE_OF_A_KINDS | FOUR_OF_A_KINDS,
+    "full house": HIGH_CARD | PAIRS | TWO_PAIRS | THREE_OF_A_KINDS | FULL_HOUSE,
+    "flush": HIGH_CARD | FLUSH,
+    "straight": HIGH_CARD | STRAIGHT,
+    "three of a kinds": HIGH_CARD | PAIRS | THREE_OF_A_KINDS,
+    "two pairs": HIGH_CARD | PAIRS | TWO_PAIRS,
+    "pairs": HIGH_CARD | PAIRS,
+    "high card": HIGH_CARD,
+}
+CATEGORY_HAND_TYPES = [CATEGORY_TYPES[name] for name in CATEGORY_NAMES]
+
 
 def is_high_straight(cards: list[Card]) -> bool:
     """
     Helper function used to both take care of the ace-high exception for straights, as
     well as help identify royal flushes from regular straight flushes.
     """
-    return sorted([c.rank.order for c in cards]) == [1, 10, 11, 12, 13]
+    return hand_rank_bits(cards) == HIGH_STRAIGHT_MASK
+
+
+def hand_rank_bits(cards: list[Card]) -> int:
+    """
+    Bitmask of the ranks present in the given cards, deuce (bit 0) to ace (bit 12)
+    """
+    return reduce(or_, [c.code for c in cards]) >> RANK_BITS_SHIFT
+
+
+def evaluate(cards: list[Card]) -> int:
+    """
+    Rank a five-card hand against every other from 1 (royal flush) to 7462 (the worst
+    possible high card); lower is better. See engine_core.eval5, of which this uses the
+    unrolled five-card version.
+    """
+    c0, c1, c2, c3, c4 = cards
+    return eval5_unrolled(c0.code, c1.code, c2.code, c3.code, c4.code)
+
+
+def hand_category(hand_rank: int) -> str:
+    """
+    Name of the best hand for a rank from evaluate, using the same keys as find_hands
+    """
+    return CATEGORY_NAMES[bisect_left(CATEGORY_WORST_RANKS, hand_rank)]
+
+
+def hand_types(hand_rank: int) -> int:
+    """
+    Bitmask of every hand type (see HAND_TYPE_NAMES) contained in a hand with the given
+    rank from evaluate; its highest bit is the best hand.
+    """
+    return CATEGORY_HAND_TYPES[bisect_left(CATEGORY_WORST_RANKS, hand_rank)]
+
+
+def best_hand(cards: list[Card]) -> str:
+    """
+    Name of the best hand that can be made from the given cards, as a find_hands key
+    """
+    return hand_category(evaluate(cards))
+
+
+def simulate_hands(n: int) -> Counter:
+    """
+    Deals n random five-card hands, each from a freshly shuffled deck, and counts how
+    often each best hand (as a find_hands key) comes up. Hands are dealt and ranked as
+    plain card codes, so no Card objects are involved.
+    """
+    hands = [sample(STANDARD_CODES, 5) for _ in range(n)]
+    return Counter(map(hand_category, eval_batch(hands)))
 
 
 def find_hands(cards: list[Card]) -> dict:
@@ -31,25 +136,44 @@ def find_hands(cards: list[Card]) -> dict:
     then a tuple of the hand is returned ordered in a sensible way (this mainly has to
     do with straights of ace-low vs. ace-high).
     """
-    high_card: Card = max(cards)  # Too simple to need a function
-    pairs: list[tuple[Card]] = find_matching_ranks(cards, 2)
-    two_pairs: list[tuple[Card]] = find_two_pairs(pairs)
-    toaks: list[tuple[Card]] = find_matching_ranks(cards, 3)
-    straight: tuple[Card] = find_straight(cards)
-    flush: tuple[Card] = find_flush(cards)
-    full_house: tuple[Card] = find_full_house(cards)
-    foaks: tuple[Card] = find_matching_ranks(cards, 4)
-    # Both straight flushes and royal flushes are trivial with our work so far
-    straight_flush: tuple[Card] = (
-        tuple(sorted(cards, key=lambda c: (c.rank.value, c.rank.order, c.suit)))
-        if straight and flush
-        else ()
+    # The hand's overall rank settles straights, flushes, and full houses outright, and
+    # tells which of the matching rank detectors can possibly find anything
+    types = hand_types(evaluate(cards))
+
+    # Every single-arrangement hand is the whole hand, so rank its cards just once
+    ranked_cards: tuple[Card] = tuple(sorted(cards, key=by_sort_key))
+
+    # Likewise, every matching rank detector works from the same grouping by rank
+    rank_buckets: list[list[Card]] = bucket_ranks(cards) if types & PAIRS else []
+
+    high_card: Card = ranked_cards[-1]
+    pairs: list[tuple[Card]] = (
+        find_matching_ranks_in_buckets(rank_buckets, 2) if types & PAIRS else []
+    )
+    two_pairs: list[tuple[Card]] = (
+        find_two_pairs_in_buckets(rank_buckets) if types & TWO_PAIRS else []
+    )
+    toaks: list[tuple[Card]] = (
+        find_matching_ranks_in_buckets(rank_buckets, 3)
+        if types & THREE_OF_A_KINDS
+        else []
     )
-    royal_flush: tuple[Card] = (
-        tuple(sorted(cards, key=lambda c: (c.rank.value, c.rank.order, c.suit)))
-        if straight_flush and is_high_straight(cards)
-        else ()
+    straight: tuple[Card] = ()
+    if types & STRAIGHT:
+        # Only the wheel plays its ace low, so move it from the top to the bottom
+        if hand_rank_bits(cards) == WHEEL_MASK:
+            straight = ranked_cards[-1:] + ranked_cards[:-1]
+        else:
+            straight = ranked_cards
+    flush: tuple[Card] = tuple(cards) if types & FLUSH else ()
+    full_house: tuple[Card] = ranked_cards if types & FULL_HOUSE else ()
+    foaks: tuple[Card] = (
+        find_matching_ranks_in_buckets(rank_buckets, 4)
+        if types & FOUR_OF_A_KINDS
+        else []
     )
+    straight_flush: tuple[Card] = ranked_cards if types & STRAIGHT_FLUSH else ()
+    royal_flush: tuple[Card] = straight_flush if types & ROYAL_FLUSH else ()
 
     return {
         "high card": high_card,
@@ -70,6 +194,16 @@ HAND-SPECIFIC FUNCTIONS
 """
 
 
+def bucket_ranks(cards: list[Card]) -> list[list[Card]]:
+    """
+    Groups the given cards into one list per rank, from deuce to ace
+    """
+    rank_buckets = [[] for _ in range(13)]
+    for c in cards:
+        rank_buckets[(c.code >> RANK_INDEX_SHIFT) & RANK_INDEX_MASK].append(c)
+    return rank_buckets
+
+
 def find_matching_ranks(cards: list[Card], n: int) -> list[tuple[Card]] | tuple[Card]:
     """
     For a given set of cards, find all sets of matching ranks of size n; for instance,
@@ -82,16 +216,21 @@ def find_matching_ranks(cards: list[Card], n: int) -> list[tuple[Card]] | tuple[
     one possible way to make a four-of-a-kind with a hand of five drawn from a standard
     deck of cards.
     """
-    combos = []
+    return find_matching_ranks_in_buckets(bucket_ranks(cards), n)
 
-    # First: count occurences of each rank in the given hand
-    card_rank_counts = Counter([c.rank for c in cards])
 
-    for card_rank, count in card_rank_counts.items():
-        if count >= n:
+def find_matching_ranks_in_buckets(
+    rank_buckets: list[list[Card]], n: int
+) -> list[tuple[Card]] | tuple[Card]:
+    """
+    find_matching_ranks, for cards already grouped by bucket_ranks
+    """
+    combos = []
+
+    for ranks_in_hand in rank_buckets:
+        if len(ranks_in_hand) >= n:
             # Find all possible combinations of two cards
             # Trivial if there are 2; n! for n > 2
-            ranks_in_hand = [c for c in cards if c.rank == card_rank]
             combos.extend(combinations(ranks_in_hand, n))
 
     if combos and n == 4:
@@ -101,20 +240,29 @@ def find_matching_ranks(cards: list[Card], n: int) -> list[tuple[Card]] | tuple[
     return combos
 
 
-def find_two_pairs(pairs: list[tuple[Card]]) -> list[tuple[Card]]:
+def find_two_pairs(cards: list[Card]) -> list[tuple[Card]]:
     """
     Finds all two pairs, which is a hand consisting of two distinct pairs, e.g.,
     a pair of twos and a pair of threes.
 
     A four-of-a-kind does not count as a two pair, but a full house necessarily always
-    contains a two pair. If you havbe a full house, then there are two possible two
+    contains a two pair. If you havbe a full house, then there are three possible two
     pairs you could play.
     """
+    return find_two_pairs_in_buckets(bucket_ranks(cards))
+
+
+def find_two_pairs_in_buckets(rank_buckets: list[list[Card]]) -> list[tuple[Card]]:
+    """
+    find_two_pairs, for cards already grouped by bucket_ranks
+    """
     two_pairs = []
 
-    for pair1, pair2 in combinations(pairs, 2):
-        # If the two pairs are unique, they can be used
-        if not set(pair1) & set(pair2):
+    # Pairs must come from two different ranks, each with at least two cards
+    paired_ranks = [b for b in rank_buckets if len(b) >= 2]
+
+    for ranks1, ranks2 in combinations(paired_ranks, 2):
+        for pair1, pair2 in product(combinations(ranks1, 2), combinations(ranks2, 2)):
             two_pairs.append(pair1 + pair2)
 
     return two_pairs
@@ -126,24 +274,23 @@ def find_straight(cards: list[Card]) -> tuple[Card]:
     [2, 3, 4, 5, 6]. Ace-low, e.g., [A, 2, 3, 4, 5] and ace-high, e.g., [10, J, Q, K, A]
     are both valid straights.
     """
+    rank_bits = hand_rank_bits(cards)
+
     # First: check for special case of ace-high
-    if is_high_straight(cards):
+    if rank_bits == HIGH_STRAIGHT_MASK:
         # Return such that Ace is ranked high
-        return tuple(sorted(cards, key=lambda c: (c.rank.value, c.rank.order)))
-
-    # Otherwise, business as usual: check for strictly- and incrementally-increasing
-    # rank order
-    ordered_ranks = sorted([c.rank.order for c in cards])
+        return tuple(sorted(cards, key=by_sort_key))
 
-    for i in range(len(ordered_ranks) - 1):
-        if (ordered_ranks[i] + 1) != ordered_ranks[i + 1]:
-            return ()
+    # Otherwise, business as usual: five distinct, consecutive ranks
+    if rank_bits not in STRAIGHT_BITMASKS:
+        return ()
 
-    return tuple(sorted(cards, key=lambda c: (c.rank.order)))
+    return tuple(sorted(cards, key=by_rank_order))
 
 
 def find_flush(cards: list[Card]) -> tuple[Card]:
-    if len(set([c.suit for c in cards])) == 1:
+    # Only a shared suit bit survives AND-ing all of the card codes
+    if reduce(and_, [c.code for c in cards]) & SUIT_MASK:
         return tuple(cards)
     return ()
 
@@ -161,5 +308,5 @@ def find_full_house(cards: list[Card]) -> tuple[Card]:
         2,
         3,
     ]:
-        return tuple(sorted(cards, key=lambda c: c.rank))
+        return tuple(sorted(cards, key=by_sort_key))
     return ()
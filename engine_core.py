@@ -0,0 +1,48 @@
+from functools import reduce
+from itertools import starmap
+from math import prod
+from operator import and_, or_
+
+
+from engine_gen import eval5_unrolled
+from engine_tables import (
+    FLUSH_TABLE,
+    PERF_HASH_ROW_MASK,
+    PERF_HASH_ROW_SHIFT,
+    PRIME_MASK,
+    RANK_BITS_SHIFT,
+    RANK_HASH_OFFSETS,
+    RANK_TABLE,
+    RANK_TABLE_MASK,
+    SUIT_MASK,
+)
+
+
+"""
+Integer-only hand evaluation over card codes (see Card), free of any Card objects
+"""
+
+
+def eval5(codes: list[int]) -> int:
+    """
+    Rank five card codes against every other hand from 1 (royal flush) to 7462 (the
+    worst possible high card); lower is better. Flushes are looked up by the bitmask of
+    their ranks, everything else by the perfect hash of the product of their rank
+    primes.
+
+    This is the reference version; eval5_unrolled is the same evaluation with each
+    reduction over the five codes unrolled. The tables only rank five-card hands, so any
+    other number of codes gives a meaningless result.
+    """
+    if reduce(and_, codes) & SUIT_MASK:
+        return FLUSH_TABLE[reduce(or_, codes) >> RANK_BITS_SHIFT]
+    key = prod([c & PRIME_MASK for c in codes])
+    offset = RANK_HASH_OFFSETS[(key >> PERF_HASH_ROW_SHIFT) & PERF_HASH_ROW_MASK]
+    return RANK_TABLE[(key + offset) & RANK_TABLE_MASK]
+
+
+def eval_batch(hands: list[list[int]]) -> list[int]:
+    """
+    Ranks many hands of five card codes at once, in the same order as given
+    """
+    return list(starmap(eval5_unrolled, hands))
@@ -0,0 +1,60 @@
+from engine_tables import (
+    FLUSH_TABLE,
+    PERF_HASH_ROW_MASK,
+    PERF_HASH_ROW_SHIFT,
+    PRIME_MASK,
+    RANK_BITS_SHIFT,
+    RANK_HASH_OFFSETS,
+    RANK_TABLE,
+    RANK_TABLE_MASK,
+    SUIT_MASK,
+)
+
+
+"""
+Generates hand evaluators specialised to a fixed number of cards: every reduction
+over the card codes in engine_core.eval5 is unrolled into a single expression
+"""
+
+EVALUATOR_TEMPLATE = """
+def eval{n}({args}):
+    if {all_and} & {suit_mask}:
+        return FLUSH_TABLE[({all_or}) >> {rank_bits_shift}]
+    key = {prime_product}
+    offset = RANK_HASH_OFFSETS[(key >> {row_shift}) & {row_mask}]
+    return RANK_TABLE[(key + offset) & {table_mask}]
+"""
+
+
+def generate_evaluator(n: int):
+    """
+    Compiles an evaluator taking n card codes as separate arguments, e.g.,
+    eval5(c0, c1, c2, c3, c4), and returning the same rank as engine_core.eval5 does
+    for the list of those codes. The tables only rank five-card hands, so n must be 5.
+    """
+    if n != 5:
+        raise ValueError(f"Hands must have exactly five cards to be ranked, not {n}")
+
+    args = [f"c{i}" for i in range(n)]
+    source = EVALUATOR_TEMPLATE.format(
+        n=n,
+        args=", ".join(args),
+        all_and=" & ".join(args),
+        all_or=" | ".join(args),
+        prime_product=" * ".join(f"({a} & {PRIME_MASK})" for a in args),
+        suit_mask=SUIT_MASK,
+        rank_bits_shift=RANK_BITS_SHIFT,
+        row_shift=PERF_HASH_ROW_SHIFT,
+        row_mask=PERF_HASH_ROW_MASK,
+        table_mask=RANK_TABLE_MASK,
+    )
+    namespace = {
+        "FLUSH_TABLE": FLUSH_TABLE,
+        "RANK_TABLE": RANK_TABLE,
+        "RANK_HASH_OFFSETS": RANK_HASH_OFFSETS,
+    }
+    exec(compile(source, f"<engine_gen eval{n}>", "exec"), namespace)
+    return namespace[f"eval{n}"]
+
+
+eval5_unrolled = generate_evaluator(5)
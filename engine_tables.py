@@ -0,0 +1,175 @@
+from array import array
+from collections import defaultdict
+from itertools import combinations
+from math import prod
+
+
+from classes.cards import Rank
+
+
+"""
+Lookup tables ranking every distinct five-card Poker hand from 1 (royal flush) to
+7462 (7-5-4-3-2 offsuit), keyed by the integer card codes described in Card
+"""
+
+# Masks over the card codes; rank bits are deuce (bit 0) to ace (bit 12)
+PRIME_MASK = 0xFF
+RANK_INDEX_SHIFT = 8
+RANK_INDEX_MASK = 0xF
+SUIT_MASK = 0xF000
+RANK_BITS_SHIFT = 16
+
+# The primes in each card's code, deuce to ace; the tables must use exactly these
+RANK_PRIMES = Rank.PRIMES
+
+# Rank indices from ace (12) down to deuce (0), i.e., from strongest to weakest
+RANKS_DESCENDING = range(12, -1, -1)
+
+# The rank table is perfect-hashed into a flat array: keys whose upper bits fold to the
+# same "row" share an offset, chosen so that no two keys land in the same slot. These
+# are the smallest row and table sizes for which such offsets exist.
+PERF_HASH_ROW_SHIFT = 13
+PERF_HASH_ROW_MASK = 0xFFF
+RANK_TABLE_SIZE = 1 << 14  # Room for the 6175 non-flush keys
+RANK_TABLE_MASK = RANK_TABLE_SIZE - 1
+
+# Worst (highest) hand rank of each category, paired with the find_hands key that
+# names its best hand
+HAND_CATEGORY_BOUNDS = (
+    (1, "royal flush"),
+    (10, "straight flush"),
+    (166, "four of a kinds"),
+    (322, "full house"),
+    (1599, "flush"),
+    (1609, "straight"),
+    (2467, "three of a kinds"),
+    (3325, "two pairs"),
+    (6185, "pairs"),
+    (7462, "high card"),
+)
+
+
+def rank_bits(ranks: tuple[int]) -> int:
+    """Bitmask with one bit set per rank index"""
+    return sum(1 << r for r in ranks)
+
+
+def prime_product(ranks: tuple[int]) -> int:
+    """Product of rank primes, which is unique to each multiset of ranks"""
+    return prod(RANK_PRIMES[r] for r in ranks)
+
+
+def build_tables() -> tuple[dict[int, int], dict[int, int]]:
+    """
+    Enumerates every hand category from strongest to weakest, assigning increasing
+    ranks as it goes.
+
+    Returns two tables: one for flushes keyed by the bitmask of their ranks (five
+    distinct ranks, so the bitmask is enough), and one for everything else keyed by the
+    prime product of their ranks.
+    """
+    flush_table, rank_table = {}, {}
+    hand_rank = 0
+
+    def add(table: dict[int, int], key: int):
+        nonlocal hand_rank
+        hand_rank += 1
+        table[key] = hand_rank
+
+    # Ace-high down to six-high, then the ace-low "wheel"
+    straights = [tuple(range(high, high - 5, -1)) for high in range(12, 3, -1)]
+    straights.append((3, 2, 1, 0, 12))
+    straight_masks = {rank_bits(s) for s in straights}
+
+    # Combinations of descending ranks come out strongest first
+    no_pairs = [
+        ranks
+        for ranks in combinations(RANKS_DESCENDING, 5)
+        if rank_bits(ranks) not in straight_masks
+    ]
+
+    for ranks in straights:  # Straight flushes, royal flush first
+        add(flush_table, rank_bits(ranks))
+
+    for quad in RANKS_DESCENDING:
+        for kicker in RANKS_DESCENDING:
+            if kicker != quad:
+                add(rank_table, prime_product((quad,) * 4 + (kicker,)))
+
+    for trips in RANKS_DESCENDING:
+        for pair in RANKS_DESCENDING:
+            if pair != trips:
+                add(rank_table, prime_product((trips,) * 3 + (pair,) * 2))
+
+    for ranks in no_pairs:  # Flushes
+        add(flush_table, rank_bits(ranks))
+
+    for ranks in straights:
+        add(rank_table, prime_product(ranks))
+
+    for trips in RANKS_DESCENDING:
+        others = [r for r in RANKS_DESCENDING if r != trips]
+        for kickers in combinations(others, 2):
+            add(rank_table, prime_product((trips,) * 3 + kickers))
+
+    for high_pair, low_pair in combinations(RANKS_DESCENDING, 2):
+        for kicker in RANKS_DESCENDING:
+            if kicker not in (high_pair, low_pair):
+                ranks = (high_pair, high_pair, low_pair, low_pair, kicker)
+                add(rank_table, prime_product(ranks))
+
+    for pair in RANKS_DESCENDING:
+        others = [r for r in RANKS_DESCENDING if r != pair]
+        for kickers in combinations(others, 3):
+            add(rank_table, prime_product((pair,) * 2 + kickers))
+
+    for ranks in no_pairs:  # High cards
+        add(rank_table, prime_product(ranks))
+
+    assert hand_rank == HAND_CATEGORY_BOUNDS[-1][0]
+
+    return flush_table, rank_table
+
+
+def build_perfect_hash(table: dict[int, int]) -> tuple[array, array]:
+    """
+    Flattens a table into an array indexed by
+        (key + offsets[(key >> PERF_HASH_ROW_SHIFT) & PERF_HASH_ROW_MASK])
+            & RANK_TABLE_MASK
+    placing the most crowded rows first, each at the lowest collision-free offset.
+
+    Returns the row offsets and the flattened table.
+    """
+    rows = defaultdict(list)
+    for key in table:
+        rows[(key >> PERF_HASH_ROW_SHIFT) & PERF_HASH_ROW_MASK].append(key)
+
+    offsets = array("H", [0]) * (PERF_HASH_ROW_MASK + 1)
+    flat_table = array("H", [0]) * RANK_TABLE_SIZE
+    for row, keys in sorted(rows.items(), key=lambda row_keys: -len(row_keys[1])):
+        for offset in range(RANK_TABLE_SIZE):
+            if not any(flat_table[(k + offset) & RANK_TABLE_MASK] for k in keys):
+                break
+        else:
+            raise ValueError(f"No collision-free offset for perfect hash row {row}")
+        offsets[row] = offset
+        for key in keys:
+            flat_table[(key + offset) & RANK_TABLE_MASK] = table[key]
+
+    return offsets, flat_table
+
+
+def build_lookup_arrays() -> tuple[array, array, array]:
+    """
+    Flattens the tables from build_tables into arrays, so that the dictionaries can be
+    discarded once the arrays are built.
+
+    Returns the flush table, indexed directly by the bitmask of a flush's ranks (at
+    most 13 bits), and the perfect hash offsets and table for every other hand.
+    """
+    flush_ranks, non_flush_ranks = build_tables()
+    flush_table = array("H", [flush_ranks.get(bits, 0) for bits in range(1 << 13)])
+    return (flush_table, *build_perfect_hash(non_flush_ranks))
+
+
+FLUSH_TABLE, RANK_HASH_OFFSETS, RANK_TABLE = build_lookup_arrays()
@@ -1,4 +1,22 @@
+from copy import deepcopy
+import pickle
+from random import Random
+
 from classes import Card, Deck
+from classes.cards import STANDARD_CODES
+from engine import (
+    HAND_TYPE_NAMES,
+    best_hand,
+    evaluate,
+    find_hands,
+    find_two_pairs,
+    hand_category,
+    hand_types,
+    simulate_hands,
+)
+from engine_tables import HAND_CATEGORY_BOUNDS
+from engine_core import eval5, eval5_unrolled, eval_batch
+from engine_gen import generate_evaluator
 
 lower_card = Card(rank=2, suit="hearts")
 higher_card = Card(rank="a", suit="clubs")
@@ -6,13 +24,25 @@ same_rank_card = Card(rank="a", suit="hearts")
 same_card = Card(rank="a", suit="clubs")
 
 assert lower_card < higher_card
+assert Card(rank="K", suit="clubs") > Card(rank="Q", suit="spades")  # Same value
+assert Card(rank="K", suit="clubs").rank > Card(rank="Q", suit="spades").rank
+assert not Card(rank="K", suit="clubs").rank <= Card(rank="Q", suit="spades").rank
+assert Card(rank="10", suit="clubs").rank < Card(rank="J", suit="clubs").rank
 assert higher_card.rank == same_rank_card.rank
+assert higher_card.rank is Card(rank="ace", suit="♥").rank  # Ranks are shared
 assert higher_card != same_rank_card  # Must match both rank and suit
 assert higher_card == same_card
 
+unpickled_card = pickle.loads(pickle.dumps(higher_card))
+assert unpickled_card == higher_card
+assert unpickled_card.rank is higher_card.rank  # Still the shared instances
+assert unpickled_card.suit is higher_card.suit
+assert deepcopy(higher_card).rank is higher_card.rank
+
 d = Deck()
 
 assert len(d.cards) == 52
+assert d.remaining == 52
 
 d.shuffle()
 
@@ -24,9 +54,90 @@ try:
 except ValueError:
     pass
 
+try:
+    d.draw(-1)
+    raise Exception("A negative number of cards was drawn")
+except ValueError:
+    pass
+
+assert d.remaining == 52
 assert len(d.draw(6)) == 6  # 52 - 6 = 46
 assert len(d.draw_hand()) == 5  # 46 - 5 = 41
 
-assert len(d.cards) == 41
+assert d.remaining == 41
+assert len(d.cards) == 52  # Drawn cards stay behind the cursor
+
+drawn = d.cards[:11]
+d.shuffle()
+assert d.cards[:11] == drawn  # Only undrawn cards are shuffled
+assert d.remaining == 41
+
+royal_flush = [Card(rank=r, suit="spades") for r in ["10", "J", "Q", "K", "A"]]
+worst_hand = [Card(rank=r, suit="clubs") for r in [2, 3, 4, 5]]
+worst_hand.append(Card(rank=7, suit="hearts"))
+full_house = [Card(rank=3, suit=s) for s in ["clubs", "hearts", "spades"]]
+full_house += [Card(rank=2, suit=s) for s in ["clubs", "hearts"]]
+
+assert evaluate(royal_flush) == 1
+assert evaluate(worst_hand) == 7462
+assert hand_category(evaluate(full_house)) == "full house"
+assert best_hand(royal_flush) == "royal flush"
+
+for worst_rank, category in HAND_CATEGORY_BOUNDS:  # Best hand is the highest type bit
+    assert HAND_TYPE_NAMES[hand_types(worst_rank).bit_length() - 1] == category
+
+wheel = [Card(rank=r, suit="hearts") for r in [3, "A", 5, 2]]
+wheel.append(Card(rank=4, suit="clubs"))
+wheel_straight = find_hands(wheel)["straight"]
+broadway = royal_flush[2:] + royal_flush[:2]  # Q, K, A, 10, J
+broadway[0] = Card(rank="Q", suit="hearts")
+broadway_straight = find_hands(broadway)["straight"]
+
+assert [c.rank.name for c in wheel_straight] == ["ace", "2", "3", "4", "5"]
+assert [c.rank.name for c in broadway_straight] == [
+    "10",
+    "jack",
+    "queen",
+    "king",
+    "ace",
+]
+assert find_hands(broadway)["flush"] == ()
+assert find_hands(royal_flush)["straight"] == find_hands(royal_flush)["royal flush"]
+assert find_hands(royal_flush)["straight flush"][-1].rank.name == "ace"
+full_house_ranks = [c.rank.name for c in find_hands(full_house)["full house"]]
+assert full_house_ranks == ["2", "2", "3", "3", "3"]
+assert best_hand(worst_hand) == "high card"
+
+simulated = simulate_hands(20000)
+
+assert sum(simulated.values()) == 20000
+assert set(simulated) <= set(HAND_TYPE_NAMES)
+assert 0.45 < simulated["high card"] / 20000 < 0.55  # About 50.1% of all hands
+assert 0.40 < simulated["pairs"] / 20000 < 0.45  # About 42.3%
+
+rng = Random(0)
+code_hands = [rng.sample(STANDARD_CODES, 5) for _ in range(2000)]
+code_hands.append([c.code for c in royal_flush])
+reference_ranks = [eval5(h) for h in code_hands]
+
+assert [eval5_unrolled(*h) for h in code_hands] == reference_ranks
+assert eval_batch(code_hands) == reference_ranks
+regenerated_eval5 = generate_evaluator(5)
+assert [regenerated_eval5(*h) for h in code_hands] == reference_ranks
+
+for hand_size in [4, 6, 7]:  # The tables only rank five-card hands
+    try:
+        generate_evaluator(hand_size)
+        raise Exception(f"Generated an evaluator for {hand_size} cards")
+    except ValueError:
+        pass
+
+four_of_a_kind = [Card(rank=9, suit=s) for s in ["clubs", "diamonds", "hearts"]]
+four_of_a_kind += [Card(rank=9, suit="spades"), Card(rank=2, suit="clubs")]
+
+assert len(find_hands(full_house)["two pairs"]) == 3
+assert find_hands(four_of_a_kind)["two pairs"] == []
+assert len(find_hands(four_of_a_kind)["four of a kinds"]) == 4
+assert find_two_pairs(full_house) == find_hands(full_house)["two pairs"]
 
 print("All tests passed!")